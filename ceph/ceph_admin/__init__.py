@@ -9,6 +9,7 @@ scenarios for verifying and validating cephadm.
 """
 from typing import Dict
 
+from ceph.parallel import parallel
 from cli.utilities.configure import setup_ibm_licence
 from utility.log import Log
 
@@ -240,8 +241,26 @@ class CephAdmin(BootstrapMixin, ShellMixin):
         Args:
             commands (List): list of commands
         """
+        # the commands only read the state, run them at once and log in order
+        with parallel() as p:
+            for cmd in commands:
+                p.spawn(self._get_command_state, cmd)
+            states = dict(p)
+
         for cmd in commands:
-            out, err = self.shell(args=[cmd])
+            out, err = states[cmd]
             logger.info(out)
             if err:
                 logger.error(err)
+
+    def _get_command_state(self, cmd):
+        """
+        Execute a cluster state command.
+
+        Args:
+            cmd (Str): command to execute
+
+        Returns:
+            cmd (Str), (out (Str), err (Str)) command and its response
+        """
+        return cmd, self.shell(args=[cmd])
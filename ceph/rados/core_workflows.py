@@ -2048,9 +2048,7 @@ class RadosOrchestrator:
         obj_name = f"{obj_name}_{obj_size}"
         installer_node = self.ceph_cluster.get_nodes(role="installer")[0]
         try:
-            out, rc = installer_node.exec_command(
-                sudo=True, cmd="rpm -qa | grep ceph-common"
-            )
+            out, rc = installer_node.exec_command(sudo=True, cmd="rpm -q ceph-common")
         except Exception:
             installer_node.exec_command(
                 sudo=True, cmd="yum install -y ceph-common --nogpgcheck"
@@ -2814,9 +2812,7 @@ class RadosOrchestrator:
 
         # Checking and installing ceph-common package on host
         try:
-            out, rc = host_node.exec_command(
-                sudo=True, cmd="rpm -qa | grep ceph-common"
-            )
+            out, rc = host_node.exec_command(sudo=True, cmd="rpm -q ceph-common")
         except Exception:
             host_node.exec_command(
                 sudo=True, cmd="yum install -y ceph-common --nogpgcheck"
@@ -1,3 +1,6 @@
+from gevent import monkey
+
+monkey.patch_all()
 import json
 import os
 import pickle
@@ -7,6 +10,7 @@ from stat import S_ISDIR, S_ISREG
 import yaml
 from docopt import docopt
 
+from ceph.parallel import parallel
 from cli.cephadm.cephadm import CephAdm
 from cli.utilities.packages import Rpm, SubscriptionManager
 from cli.utilities.utils import (
@@ -165,39 +169,45 @@ def get_ceph_var_logs(cluster, log_dir):
     This method is to download and store
     ceph cluster var logs into log directory.
     """
-    for node in cluster.get_nodes():
-        download_dir = os.path.join(log_dir, "ceph_logs", node.hostname)
-        os.makedirs(download_dir, exist_ok=True)
-        file_attributes = node.get_listdir_attr(dir_path=CEPH_VAR_LOG_DIR, sudo=True)
-        for attribute in file_attributes:
-            if S_ISDIR(attribute.st_mode):
-                os.makedirs(
-                    os.path.join(download_dir, attribute.filename), exist_ok=True
-                )
-                ceph_files = node.get_dir_list(
-                    dir_path=os.path.join(CEPH_VAR_LOG_DIR, attribute.filename),
-                    sudo=True,
-                )
-                for ceph_file in ceph_files:
-                    node.download_file(
-                        src=os.path.join(
-                            CEPH_VAR_LOG_DIR, attribute.filename, ceph_file
-                        ),
-                        dst=os.path.join(download_dir, attribute.filename, ceph_file),
-                        sudo=True,
-                    )
-                    log.info(
-                        f"Downloading {ceph_file} from {node.hostname} to {download_dir}/{attribute.filename}"
-                    )
-            elif S_ISREG(attribute.st_mode):
+    # Each node has its own SFTP session, download from all of them at once
+    with parallel() as p:
+        for node in cluster.get_nodes():
+            p.spawn(get_node_var_logs, node, log_dir)
+
+
+def get_node_var_logs(node, log_dir):
+    """
+    This method is to download and store
+    ceph var logs of a node into log directory.
+    """
+    download_dir = os.path.join(log_dir, "ceph_logs", node.hostname)
+    os.makedirs(download_dir, exist_ok=True)
+    file_attributes = node.get_listdir_attr(dir_path=CEPH_VAR_LOG_DIR, sudo=True)
+    for attribute in file_attributes or []:
+        if S_ISDIR(attribute.st_mode):
+            os.makedirs(os.path.join(download_dir, attribute.filename), exist_ok=True)
+            ceph_files = node.get_dir_list(
+                dir_path=os.path.join(CEPH_VAR_LOG_DIR, attribute.filename),
+                sudo=True,
+            )
+            for ceph_file in ceph_files or []:
                 node.download_file(
-                    src=os.path.join(CEPH_VAR_LOG_DIR, attribute.filename),
-                    dst=os.path.join(download_dir, attribute.filename),
+                    src=os.path.join(CEPH_VAR_LOG_DIR, attribute.filename, ceph_file),
+                    dst=os.path.join(download_dir, attribute.filename, ceph_file),
                     sudo=True,
                 )
                 log.info(
-                    f"Downloading {attribute.filename} from {node.hostname} to {download_dir}"
+                    f"Downloading {ceph_file} from {node.hostname} to {download_dir}/{attribute.filename}"
                 )
+        elif S_ISREG(attribute.st_mode):
+            node.download_file(
+                src=os.path.join(CEPH_VAR_LOG_DIR, attribute.filename),
+                dst=os.path.join(download_dir, attribute.filename),
+                sudo=True,
+            )
+            log.info(
+                f"Downloading {attribute.filename} from {node.hostname} to {download_dir}"
+            )
 
 
 def write_output(data, output):
@@ -25,6 +25,7 @@ from libcloud.common.types import LibcloudError
 import init_suite
 from ceph.ceph import Ceph, CephNode
 from ceph.clients import WinNode
+from ceph.parallel import parallel
 from ceph.utils import (
     cleanup_ceph_nodes,
     cleanup_ibmc_ceph_nodes,
@@ -271,12 +272,10 @@ def create_nodes(
     log.info("Sleeping 15 Seconds")
     time.sleep(15)
 
-    for cluster_name, cluster in ceph_cluster_dict.items():
-        for instance in cluster:
-            try:
-                instance.connect()
-            except BaseException:
-                raise
+    with parallel() as p:
+        for cluster_name, cluster in ceph_cluster_dict.items():
+            for instance in cluster:
+                p.spawn(instance.connect)
 
     return ceph_cluster_dict, clients
 
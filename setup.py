@@ -30,6 +30,7 @@ setup(
         "jinja_markdown",
         "jinja2",
         "junitparser",
+        "packaging",
         "paramiko",
         "plotly",
         "pyyaml",
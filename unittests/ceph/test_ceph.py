@@ -0,0 +1,672 @@
+import pickle
+import posixpath
+
+import mock
+import pytest
+from packaging.version import Version
+
+from ceph.ceph import (
+    Ceph,
+    CephNode,
+    CephObjectFactory,
+    NodeVolume,
+    SocketTimeoutException,
+    _parse_release,
+)
+
+
+class MockVmNode:
+    def __init__(self):
+        self.node_type = "openstack"
+        self.osd_scenario = None
+        self.location = "default"
+
+
+class MockCephNode:
+    """Ceph node without connections, the ceph objects are created as for CephNode."""
+
+    role = CephNode.role
+    get_ceph_objects = CephNode.get_ceph_objects
+    get_ceph_demons = CephNode.get_ceph_demons
+    get_free_volumes = CephNode.get_free_volumes
+    get_allocated_volumes = CephNode.get_allocated_volumes
+    create_ceph_object = CephNode.create_ceph_object
+    remove_ceph_object = CephNode.remove_ceph_object
+
+    def __init__(self, name, roles, volumes=0, pkg_type="rpm", hostname=None):
+        self.shortname = name
+        self.hostname = hostname or f"{name}.ceph.local"
+        self.vmname = name
+        self.ip_address = f"10.0.0.{name[-1]}"
+        self.pkg_type = pkg_type
+        self.osd_scenario = None
+        self.vm_node = MockVmNode()
+        self.volume_list = [NodeVolume(NodeVolume.FREE) for _ in range(volumes)]
+        self.ceph_object_list = [
+            CephObjectFactory(self).create_ceph_object(role) for role in roles
+        ]
+        while self.get_ceph_objects("osd") and self.get_free_volumes():
+            self.ceph_object_list.append(
+                CephObjectFactory(self).create_ceph_object("osd")
+            )
+
+    def search_ethernet_interface(self, ceph_node_list):
+        return "eth0"
+
+    def set_eth_interface(self, eth_interface):
+        self.eth_interface = eth_interface
+
+    def create_lvm(self, devices, num=None, check_lvm=True):
+        return [
+            {"data": f"data-lv{index}", "data_vg": f"vg{index}"}
+            for index, _ in enumerate(devices)
+        ]
+
+    def multiple_lvm_scenarios(self, devices, scenario):
+        dmcrypt = scenario.__name__.endswith("dmcrypt")
+        return {
+            self.hostname: [
+                "{'data': 'data-lv1', 'data_vg': 'vg1'}",
+                {"dmcrypt": dmcrypt},
+                {"batch": False},
+            ]
+        }
+
+
+def create_cluster(rhbuild, ansible_config):
+    nodes = [
+        MockCephNode("node1", ["mon", "mgr", "installer"]),
+        MockCephNode("node2", ["osd", "mds"], volumes=3),
+        MockCephNode("node3", ["osd", "rgw", "nfs"], volumes=2),
+        MockCephNode("node4", ["client", "grafana", "iscsi-gw"]),
+        MockCephNode(
+            "node5", ["osd", "nfs"], volumes=2, pkg_type="deb", hostname="pool-node5"
+        ),
+    ]
+    cluster = Ceph("ceph", nodes)
+    cluster.allow_custom_ansible_config = False
+    cluster.rhcs_version = rhbuild
+    cluster.ansible_config = dict(ansible_config)
+    return cluster
+
+
+# Inventories generated by the if-ladder implementation the role table replaced
+INVENTORIES = {
+    "collocated": (
+        "4.3",
+        {"osd_scenario": "collocated"},
+        {},
+        "[mons]\n"
+        "node1 monitor_interface=eth0\n"
+        "[mgrs]\n"
+        "node1 monitor_interface=eth0\n"
+        "[osds]\n"
+        'node2 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc", "/dev/vdd"]\' \n'
+        'node3 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc"]\' \n'
+        'node5 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc"]\' \n'
+        "[mdss]\n"
+        "node2 monitor_interface=eth0\n"
+        "[nfss]\n"
+        "node3 monitor_interface=eth0\n"
+        "[rgws]\n"
+        "node3 radosgw_interface=eth0\n"
+        "[clients]\n"
+        "node4 client_interface=eth0\n"
+        "[iscsigws]\n"
+        "node4\n"
+        "[grafana-server]\n"
+        "node4 grafana_interface=eth0\n",
+    ),
+    "collocated_rhcs_2": (
+        "2.5",
+        {"osd_scenario": "collocated"},
+        {},
+        "[mons]\n"
+        "node1 monitor_interface=eth0\n"
+        "[osds]\n"
+        'node2 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc", "/dev/vdd"]\' \n'
+        'node3 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc"]\' \n'
+        'node5 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc"]\' \n'
+        "[mdss]\n"
+        "node2 monitor_interface=eth0\n"
+        "[rgws]\n"
+        "node3 radosgw_interface=eth0\n"
+        "[clients]\n"
+        "node4 client_interface=eth0\n"
+        "[iscsigws]\n"
+        "node4\n"
+        "[grafana-server]\n"
+        "node4 grafana_interface=eth0\n",
+    ),
+    "non_collocated": (
+        "4.3",
+        {"osd_scenario": "non-collocated", "dedicated_devices": ["/dev/vdb"]},
+        {},
+        "[mons]\n"
+        "node1 monitor_interface=eth0\n"
+        "[mgrs]\n"
+        "node1 monitor_interface=eth0\n"
+        "[osds]\n"
+        'node2 monitor_interface=eth0  devices=\'["/dev/vdc", "/dev/vdd"]\' \n'
+        "node3 monitor_interface=eth0  devices='[\"/dev/vdc\"]' \n"
+        "node5 monitor_interface=eth0  devices='[\"/dev/vdc\"]' \n"
+        "[mdss]\n"
+        "node2 monitor_interface=eth0\n"
+        "[nfss]\n"
+        "node3 monitor_interface=eth0\n"
+        "[rgws]\n"
+        "node3 radosgw_interface=eth0\n"
+        "[clients]\n"
+        "node4 client_interface=eth0\n"
+        "[iscsigws]\n"
+        "node4\n"
+        "[grafana-server]\n"
+        "node4 grafana_interface=eth0\n",
+    ),
+    "lvm": (
+        "4.3",
+        {"osd_scenario": "lvm"},
+        {},
+        "[mons]\n"
+        "node1 monitor_interface=eth0\n"
+        "[mgrs]\n"
+        "node1 monitor_interface=eth0\n"
+        "[osds]\n"
+        "node2 monitor_interface=eth0  lvm_volumes='["
+        '{"data": "data-lv0", "data_vg": "vg0"}, '
+        '{"data": "data-lv1", "data_vg": "vg1"}, '
+        '{"data": "data-lv2", "data_vg": "vg2"}]\' \n'
+        "node3 monitor_interface=eth0  lvm_volumes='["
+        '{"data": "data-lv0", "data_vg": "vg0"}, '
+        '{"data": "data-lv1", "data_vg": "vg1"}]\' \n'
+        "node5 monitor_interface=eth0  lvm_volumes='["
+        '{"data": "data-lv0", "data_vg": "vg0"}, '
+        '{"data": "data-lv1", "data_vg": "vg1"}]\' \n'
+        "[mdss]\n"
+        "node2 monitor_interface=eth0\n"
+        "[nfss]\n"
+        "node3 monitor_interface=eth0\n"
+        "[rgws]\n"
+        "node3 radosgw_interface=eth0\n"
+        "[clients]\n"
+        "node4 client_interface=eth0\n"
+        "[iscsigws]\n"
+        "node4\n"
+        "[grafana-server]\n"
+        "node4 grafana_interface=eth0\n",
+    ),
+    "mixed_lvm": (
+        "4.3",
+        {"osd_scenario": "lvm"},
+        {"mixed_lvm_confs": True},
+        "[mons]\n"
+        "node1 monitor_interface=eth0\n"
+        "[mgrs]\n"
+        "node1 monitor_interface=eth0\n"
+        "[osds]\n"
+        "node2 monitor_interface=eth0  lvm_volumes=\"[{'data': 'data-lv1', 'data_vg': 'vg1'}]\" \n"
+        "node3 monitor_interface=eth0  lvm_volumes=\"[{'data': 'data-lv1', 'data_vg': 'vg1'}]\" dmcrypt='True' \n"
+        'node5 monitor_interface=eth0  lvm_volumes=\'[{"data": "data-lv0", "data_vg": "vg0"}]\' \n'
+        "[mdss]\n"
+        "node2 monitor_interface=eth0\n"
+        "[nfss]\n"
+        "node3 monitor_interface=eth0\n"
+        "[rgws]\n"
+        "node3 radosgw_interface=eth0\n"
+        "[clients]\n"
+        "node4 client_interface=eth0\n"
+        "[iscsigws]\n"
+        "node4\n"
+        "[grafana-server]\n"
+        "node4 grafana_interface=eth0\n",
+    ),
+    "filestore": (
+        "3.3",
+        {"osd_scenario": "collocated"},
+        {"filestore": True},
+        "[mons]\n"
+        "node1 monitor_interface=eth0\n"
+        "[mgrs]\n"
+        "node1 monitor_interface=eth0\n"
+        "[osds]\n"
+        'node2 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc", "/dev/vdd"]\'  osd_objectstore="filestore" \n'
+        'node3 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc"]\'  osd_objectstore="filestore" \n'
+        'node5 monitor_interface=eth0  devices=\'["/dev/vdb", "/dev/vdc"]\'  osd_objectstore="filestore" \n'
+        "[mdss]\n"
+        "node2 monitor_interface=eth0\n"
+        "[nfss]\n"
+        "node3 monitor_interface=eth0\n"
+        "[rgws]\n"
+        "node3 radosgw_interface=eth0\n"
+        "[clients]\n"
+        "node4 client_interface=eth0\n"
+        "[iscsigws]\n"
+        "node4\n"
+        "[grafana-server]\n"
+        "node4 grafana_interface=eth0\n",
+    ),
+    "auto_discovery": (
+        "4.3",
+        {"osd_scenario": "collocated", "osd_auto_discovery": True},
+        {},
+        "[mons]\n"
+        "node1 monitor_interface=eth0\n"
+        "[mgrs]\n"
+        "node1 monitor_interface=eth0\n"
+        "[osds]\n"
+        "node2 monitor_interface=eth0  \n"
+        "node3 monitor_interface=eth0  \n"
+        "node5 monitor_interface=eth0  \n"
+        "[mdss]\n"
+        "node2 monitor_interface=eth0\n"
+        "[nfss]\n"
+        "node3 monitor_interface=eth0\n"
+        "[rgws]\n"
+        "node3 radosgw_interface=eth0\n"
+        "[clients]\n"
+        "node4 client_interface=eth0\n"
+        "[iscsigws]\n"
+        "node4\n"
+        "[grafana-server]\n"
+        "node4 grafana_interface=eth0\n",
+    ),
+}
+
+
+class TestGenerateAnsibleInventory:
+    @pytest.mark.parametrize("name", sorted(INVENTORIES))
+    def test_inventory(self, name):
+        rhbuild, ansible_config, kwargs, expected = INVENTORIES[name]
+        cluster = create_cluster(rhbuild, ansible_config)
+        assert cluster.generate_ansible_inventory(**kwargs) == expected
+
+    def test_inventory_with_new_osd_volume(self):
+        cluster = create_cluster("4.3", {"osd_scenario": "collocated"})
+        node = cluster.get_node_by_hostname("node3.ceph.local")
+        node.volume_list.append(NodeVolume(NodeVolume.FREE))
+        osd_host = "node3 monitor_interface=eth0  devices='[{devices}]' \n"
+
+        inventory = cluster.generate_ansible_inventory()
+        assert osd_host.format(devices='"/dev/vdb", "/dev/vdc"') in inventory
+
+        # test_ansible_roll_over allocates a free volume of an existing osd node
+        node.get_free_volumes().pop().status = NodeVolume.ALLOCATED
+        inventory = cluster.generate_ansible_inventory()
+        assert (
+            osd_host.format(devices='"/dev/vdb", "/dev/vdc", "/dev/vdd"') in inventory
+        )
+
+
+def _remove_rgw(cluster):
+    node = cluster[2]
+    node.remove_ceph_object(node.get_ceph_objects("rgw")[0])
+
+
+# cluster change and the rgw nodes expected afterwards
+INDEX_CHANGES = {
+    "unchanged": (lambda cluster: None, ["node3"]),
+    "appended_node": (
+        lambda cluster: cluster.node_list.append(MockCephNode("node6", ["rgw"])),
+        ["node3", "node6"],
+    ),
+    "replaced_node": (
+        lambda cluster: cluster.__setitem__(2, MockCephNode("node6", ["mon"])),
+        [],
+    ),
+    "deleted_node": (lambda cluster: cluster.__delitem__(2), []),
+    "created_object": (
+        lambda cluster: cluster[0].create_ceph_object("rgw"),
+        ["node1", "node3"],
+    ),
+    "removed_object": (_remove_rgw, []),
+}
+
+
+class TestRoleIndices:
+    @pytest.mark.parametrize("name", sorted(INDEX_CHANGES))
+    def test_lookups_follow_cluster_changes(self, name):
+        change, expected = INDEX_CHANGES[name]
+        cluster = create_cluster("4.3", {})
+        assert [node.shortname for node in cluster.get_nodes("rgw")] == ["node3"]
+        assert len(cluster.get_ceph_objects("rgw")) == 1
+
+        change(cluster)
+        nodes = cluster.get_nodes("rgw")
+        assert [node.shortname for node in nodes] == expected
+        assert len(cluster.get_ceph_objects("rgw")) == len(expected)
+
+    def test_lookups_are_reused(self):
+        cluster = create_cluster("4.3", {})
+        cluster.get_nodes("osd")
+        role_to_nodes, role_to_objs = cluster._get_indices()
+
+        assert cluster._get_indices() == (role_to_nodes, role_to_objs)
+        assert cluster._get_indices()[0] is role_to_nodes
+        assert "osd" in role_to_nodes
+
+        # the returned lists are copies, changing them keeps the lookups intact
+        cluster.get_nodes("osd").clear()
+        assert len(cluster.get_nodes("osd")) == 3
+
+
+# node renamed after the index is built and its new hostname, looked up
+# hostname, expected node
+HOSTNAME_LOOKUPS = {
+    "indexed": (None, None, "node2.ceph.local", "node2"),
+    "unknown": (None, None, "node9.ceph.local", None),
+    "renamed_new_name": ("node2", "node2.example.com", "node2.example.com", "node2"),
+    "renamed_old_name": ("node2", "node2.example.com", "node2.ceph.local", None),
+    "duplicate": ("node3", "node2.ceph.local", "node2.ceph.local", "node2"),
+}
+
+
+class TestGetNodeByHostname:
+    @pytest.mark.parametrize("name", sorted(HOSTNAME_LOOKUPS))
+    def test_lookup(self, name):
+        renamed, new_hostname, hostname, expected = HOSTNAME_LOOKUPS[name]
+        cluster = create_cluster("4.3", {})
+        # the index is built before the hostname changes, as after a reconnect
+        assert cluster.get_node_by_hostname("node1.ceph.local") is cluster[0]
+        if renamed:
+            node = next(node for node in cluster if node.shortname == renamed)
+            node.hostname = new_hostname
+
+        node = cluster.get_node_by_hostname(hostname)
+        assert (node.shortname if node else None) == expected
+        # the next lookup gives the same node from the rebuilt index
+        assert cluster.get_node_by_hostname(hostname) is node
+
+
+# output of the "iface rc" ping loop, two peers ping on each interface
+PING_RESULTS = {
+    "all_passed": ("eth0 0\neth1 0\neth0 0\neth1 0\n", "eth0"),
+    "first_failed_once": ("eth1 0\neth0 1\neth1 0\neth0 0\n", "eth1"),
+    "all_failed": ("eth0 1\neth1 2\neth0 1\neth1 2\n", None),
+    "missing_result": ("eth0 0\neth1 0\neth1 0\n", "eth1"),
+    "unknown_interface": ("eth2 0\neth2 0\neth1 0\neth1 0\n", "eth1"),
+    "garbage": ("eth0 0\nping: unknown host\n\neth0 0\n", "eth0"),
+}
+
+
+class TestSearchEthernetInterface:
+    @staticmethod
+    def create_node(*outputs):
+        node = CephNode.__new__(CephNode)
+        node.ip_address = "10.0.0.1"
+        node.vmname = "node1"
+        node.exec_command = mock.Mock(side_effect=[(out, "") for out in outputs])
+        return node
+
+    @pytest.mark.parametrize("name", sorted(PING_RESULTS))
+    def test_interface(self, name):
+        out, expected = PING_RESULTS[name]
+        node = self.create_node("eth0\neth1\n", out)
+        peers = [MockCephNode(peer, []) for peer in ("node1", "node2", "node3")]
+
+        assert node.search_ethernet_interface(peers) == expected
+        ping_cmd = node.exec_command.call_args.kwargs["cmd"]
+        assert "for iface in eth0 eth1; do for peer in node2 node3; do" in ping_cmd
+
+    def test_single_node(self):
+        node = self.create_node("eth0\neth1\n")
+
+        assert node.search_ethernet_interface([MockCephNode("node1", [])]) == "eth0"
+        assert node.exec_command.call_count == 1
+
+
+# buffered output, final flag, logged lines and the output left in the buffer
+OUTPUT_LINES = {
+    "complete_lines": (b"a\nb\n", False, ["a", "b"], b""),
+    "partial_line": (b"a\nb\npar", False, ["a", "b"], b"par"),
+    "only_partial": (b"partial", False, [], b"partial"),
+    "final_partial": (b"a\npartial", True, ["a", "partial"], b""),
+    "crlf": (b"a\r\nb\r\n", False, ["a", "b"], b""),
+    "invalid_utf8": (b"\xff ok\n", False, ["\ufffd ok"], b""),
+    "empty": (b"", True, [], b""),
+}
+
+
+class TestLogLines:
+    @pytest.mark.parametrize("name", sorted(OUTPUT_LINES))
+    def test_log_lines(self, name):
+        output, final, lines, left = OUTPUT_LINES[name]
+        pending = bytearray(output)
+
+        with mock.patch("ceph.ceph.logger") as logger:
+            CephNode._log_lines(pending, final=final)
+
+        assert [call.args[0] for call in logger.debug.call_args_list] == lines
+        assert pending == left
+
+    def test_line_split_across_chunks(self):
+        pending = bytearray()
+        with mock.patch("ceph.ceph.logger") as logger:
+            for chunk in (b"first li", b"ne\nsecond", b" line\n"):
+                pending.extend(chunk)
+                CephNode._log_lines(pending)
+
+        assert [call.args[0] for call in logger.debug.call_args_list] == [
+            "first line",
+            "second line",
+        ]
+
+
+class FakeSftp:
+    """SFTP client creating directories below the `writable` directory only."""
+
+    def __init__(self, existing, writable):
+        self.existing = set(existing)
+        self.writable = writable
+        self.created = []
+
+    def mkdir(self, path):
+        path = posixpath.normpath(path)
+        parent = posixpath.dirname(path)
+        if (
+            path in self.existing
+            or (parent and parent not in self.existing)
+            or not path.startswith(self.writable)
+        ):
+            raise IOError(path)
+        self.existing.add(path)
+        self.created.append(path)
+
+    def stat(self, path):
+        if posixpath.normpath(path) not in self.existing:
+            raise IOError(path)
+
+
+# existing directories, writable directory, directory to create, directories
+# created over SFTP and whether the root shell fallback runs
+CREATE_DIRS = {
+    "parent_exists": (
+        ["/home", "/home/cephuser"],
+        "/home/cephuser",
+        "/home/cephuser/a",
+        ["/home/cephuser/a"],
+        False,
+    ),
+    "missing_parents": (
+        ["/home", "/home/cephuser"],
+        "/home/cephuser",
+        "/home/cephuser/a/b/c",
+        ["/home/cephuser/a", "/home/cephuser/a/b", "/home/cephuser/a/b/c"],
+        False,
+    ),
+    "already_exists": (
+        ["/home", "/home/cephuser"],
+        "/home/cephuser",
+        "/home/cephuser",
+        [],
+        False,
+    ),
+    "trailing_slash": (
+        ["/home", "/home/cephuser"],
+        "/home/cephuser",
+        "/home/cephuser/a/b/",
+        ["/home/cephuser/a", "/home/cephuser/a/b"],
+        False,
+    ),
+    "relative": (["a"], "a", "a/b/c", ["a/b", "a/b/c"], False),
+    "not_permitted": (["/", "/etc"], "/home", "/etc/ceph/conf.d", [], True),
+}
+
+
+class TestCreateDirs:
+    @pytest.mark.parametrize("name", sorted(CREATE_DIRS))
+    def test_create_dirs(self, name):
+        existing, writable, dir_path, created, root_shell = CREATE_DIRS[name]
+        sftp = FakeSftp(existing, writable)
+        node = CephNode.__new__(CephNode)
+        node._get_sftp = mock.Mock(return_value=sftp)
+        node.exec_command = mock.Mock()
+
+        node.create_dirs(dir_path, sudo=True)
+
+        node._get_sftp.assert_called_once_with(True)
+        assert sftp.created == created
+        if root_shell:
+            node.exec_command.assert_called_once_with(
+                cmd=f"mkdir -p {dir_path}", sudo=True
+            )
+        else:
+            node.exec_command.assert_not_called()
+
+
+# rhbuild values and their numeric release, None when it is not a release
+RELEASES = {
+    "major": ("5", "5"),
+    "minor": ("5.3", "5.3"),
+    "patch": ("4.3.1", "4.3.1"),
+    "platform_suffix": ("5.3-rhel-9", "5.3"),
+    "zstream_suffix": ("6.1z2", "6.1"),
+    "trailing_dot": ("7.", "7"),
+    "name": ("nautilus", None),
+    "prefixed": ("rhcs-5.3", None),
+    "empty": ("", None),
+}
+
+
+class TestParseRelease:
+    @pytest.mark.parametrize("name", sorted(RELEASES))
+    def test_parse_release(self, name):
+        version, release = RELEASES[name]
+        if release is None:
+            with pytest.raises(ValueError):
+                _parse_release(version)
+        else:
+            assert _parse_release(version) == Version(release)
+
+    @pytest.mark.parametrize("name", sorted(RELEASES))
+    def test_rhcs_version(self, name):
+        version, release = RELEASES[name]
+        cluster = create_cluster("4.3", {})
+        if release is None and version:
+            with pytest.raises(ValueError):
+                cluster.rhcs_version = version
+        else:
+            cluster.rhcs_version = version
+            # unset versions fall back to the default release
+            assert cluster.rhcs_release == Version(release or "4.3")
+            assert str(cluster.rhcs_version) == (version or "4.3")
+
+
+class FakeClock:
+    """Clock advanced by the select calls of the long running loop."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def select(self, rlist, wlist, xlist, timeout):
+        self.now += timeout
+        return rlist, [], []
+
+
+class FakeChannel:
+    """Channel sending `output` at the given clock times and exiting at `exit_at`."""
+
+    def __init__(self, clock, output, exit_at):
+        self.clock = clock
+        self.output = list(output)
+        self.exit_at = exit_at
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def set_combine_stderr(self, combine):
+        pass
+
+    def exec_command(self, cmd):
+        pass
+
+    def exit_status_ready(self):
+        return self.exit_at is not None and self.clock.now >= self.exit_at
+
+    def recv_ready(self):
+        return bool(self.output) and self.output[0][0] <= self.clock.now
+
+    def recv(self, nbytes):
+        return self.output.pop(0)[1]
+
+    def recv_exit_status(self):
+        return 0
+
+    def close(self):
+        self.closed = True
+
+
+LONG_RUNNING = {
+    # a line every second for 10 seconds, past the 3 seconds timeout
+    "chatty": ([(t, b"progress\n") for t in range(1, 10)], 10, None),
+    "quiet_exit": ([], 2, None),
+    "idle": ([(1, b"started\n")], None, 4),
+    "hang": ([], None, 3),
+}
+
+
+class TestLongRunning:
+    @pytest.mark.parametrize("name", sorted(LONG_RUNNING))
+    def test_timeout_counts_idle_time(self, name):
+        output, exit_at, timed_out_at = LONG_RUNNING[name]
+        clock = FakeClock()
+        channel = FakeChannel(clock, output, exit_at)
+        node = CephNode.__new__(CephNode)
+        node.ip_address = "10.0.0.1"
+        node._open_session = mock.Mock(return_value=channel)
+
+        with mock.patch("ceph.ceph.monotonic", clock.monotonic), mock.patch(
+            "ceph.ceph.select.select", clock.select
+        ):
+            if timed_out_at is None:
+                assert node.long_running(cmd="cmd", timeout=3) == 0
+                assert not channel.closed
+            else:
+                with pytest.raises(SocketTimeoutException):
+                    node.long_running(cmd="cmd", timeout=3)
+                assert channel.closed
+                assert clock.now == pytest.approx(timed_out_at, abs=0.2)
+
+
+OSD_SCENARIOS = {
+    "json": b'[{"data": "lv0", "data_vg": "vg0"}]',
+    "pickle": pickle.dumps([{"data": "lv0", "data_vg": "vg0"}]),
+}
+
+
+class TestOsdScenarios:
+    @pytest.mark.parametrize("name", sorted(OSD_SCENARIOS))
+    def test_load_osd_scenarios(self, name, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "osd_scenarios_node1").write_bytes(OSD_SCENARIOS[name])
+        node = CephNode.__new__(CephNode)
+        node.hostname = "node1"
+
+        assert node._load_osd_scenarios() == [{"data": "lv0", "data_vg": "vg0"}]
+
+        node._save_osd_scenarios([{"data": "lv1", "data_vg": "vg1"}])
+        (tmp_path / "osd_scenarios_node1").unlink()
+        assert node._load_osd_scenarios() == [{"data": "lv1", "data_vg": "vg1"}]